@@ -1,12 +1,14 @@
 
 import sys
+import re
 import logging
+from collections import deque
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QSplitter, QMessageBox,
     QVBoxLayout, QLabel, QLineEdit, QPlainTextEdit, QPushButton, QHBoxLayout
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtCore import Qt, QTimer, QElapsedTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QPalette, QTextCursor
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
@@ -14,22 +16,36 @@ import config
 
 from controller_core import ControllerCore
 import serial_manager
-import numpy as np
 from debug_viewer import Viewer, _parse
 
+# MCU metric tags, e.g. "#frametime 1234#" (value in microseconds)
+_FRAMETIME_RE = re.compile(r"#frametime\s+(\d+)#")
+_ANIMTIME_RE  = re.compile(r"#animtime\s+(\d+)#")
+
+# gyro command template (bound once, reused every GYRO_SEND_RATE tick)
+_GYRO_FMT = "#gyro x={:+.3f},y={:+.3f},z={:+.3f}#".format
+
 
 class QtConsoleHandler(logging.Handler):
     def __init__(self, console_widget):
         super().__init__()
         self.console = console_widget
-        self.setFormatter(logging.Formatter('%(message)s'))
 
     def emit(self, record):
-        msg = self.format(record)
+        # plain message only; the Formatter is needed just for tracebacks
+        if record.exc_info:
+            msg = self.format(record)
+        elif record.args:
+            msg = record.getMessage()
+        else:
+            msg = str(record.msg)
         self.console.appendPlainText(msg)
 
 
 class AppWindow(QMainWindow):
+    # emitted from the serial reader thread; queued onto the GUI thread
+    rx_ready = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Poly Debug")
@@ -79,7 +95,7 @@ class AppWindow(QMainWindow):
         self.autoscroll_recv = True  
         btn_recv = QPushButton("RX"); btn_recv.setCheckable(True); btn_recv.setChecked(True); btn_recv.setFixedSize(40,20)  
         btn_recv.setStyleSheet('QPushButton {background-color: #1a1a1a; color: #eee;}')
-        btn_recv.clicked.connect(lambda v: setattr(self, 'autoscroll_recv', v))  
+        btn_recv.clicked.connect(self._set_autoscroll_recv)
         hbox.addWidget(btn_recv)  
         hbox.addStretch(1)  
         
@@ -106,6 +122,8 @@ class AppWindow(QMainWindow):
         # 1) Sent & log console – define it first
         self.sent_console = QPlainTextEdit()
         self.sent_console.setReadOnly(True)
+        self.sent_console.setMaximumBlockCount(config.CONSOLE_MAX_LINES)
+        self.sent_console.setUndoRedoEnabled(False)
         self.sent_console.setStyleSheet("background-color: #1a1a1a; color: #eee;")
 
         # 2) Composite: Sent console + Input line
@@ -134,6 +152,8 @@ class AppWindow(QMainWindow):
         # 3) Received console (2/3)
         self.recv_console = QPlainTextEdit()
         self.recv_console.setReadOnly(True)
+        self.recv_console.setMaximumBlockCount(config.CONSOLE_MAX_LINES)
+        self.recv_console.setUndoRedoEnabled(False)
         self.recv_console.setStyleSheet("background-color: #1a1a1a; color: #eee;")
         # wrap in a widget for consistent margins/border
         recv_widget = QWidget()
@@ -151,7 +171,6 @@ class AppWindow(QMainWindow):
         canvas_layout = QVBoxLayout(canvas_widget)
         self.figure = Figure(facecolor='#353535')
         self.canvas = FigureCanvas(self.figure)
-        self.canvas.toolbar_visible = False
         canvas_layout.addWidget(self.canvas)
 
         main_splitter.addWidget(left_splitter)
@@ -164,8 +183,10 @@ class AppWindow(QMainWindow):
         # ─── Metrics display (rolling averages) ─────────────────────────────────
         # how many samples to average over
         self.metrics_history = config.METRICS_HISTORY
-        self.frame_times = []
-        self.anim_times = []
+        self.frame_times = deque(maxlen=self.metrics_history)
+        self.anim_times = deque(maxlen=self.metrics_history)
+        self._frame_sum = 0.0   # running sums → O(1) average per sample
+        self._anim_sum = 0.0
 
         # build a little bar above the autoscroll controls
         metrics_widget = QWidget()
@@ -194,32 +215,19 @@ class AppWindow(QMainWindow):
 
         # override serial_manager._log_recv to filter out metrics & #face# tags
         orig_log_recv = serial_manager._log_recv
+        # tag → (pattern, handler taking raw microseconds)
+        self._metric_handlers = {
+            "#frametime": (_FRAMETIME_RE, self._on_frametime),
+            "#animtime":  (_ANIMTIME_RE,  self._on_animtime),
+        }
         def _filtered_log_recv(msg):
-            # ─── intercept frametime updates ───────────────────────────
-            if msg.startswith("#frametime"):
-                import re
-                m = re.match(r"#frametime\s+(\d+)#", msg)
-                if m:
-                    us  = int(m.group(1))       # raw microseconds
-                    val = us / 1000.0           # convert to milliseconds
-                    self.frame_times.append(val)
-                    if len(self.frame_times) > self.metrics_history:
-                        self.frame_times.pop(0)
-                    avg = sum(self.frame_times) / len(self.frame_times)
-                    self.lbl_frame_time.setText(f"Avg frame: {avg:.2f} ms")
-                return
-
-            if msg.startswith("#animtime"):
-                import re
-                m = re.match(r"#animtime\s+(\d+)#", msg)
+            # ─── intercept frametime / animtime updates ────────────────
+            metric = self._metric_handlers.get(msg.partition(" ")[0])
+            if metric:
+                pattern, on_value = metric
+                m = pattern.match(msg)
                 if m:
-                    us  = int(m.group(1))
-                    val = us / 1000.0          # convert to milliseconds
-                    self.anim_times.append(val)
-                    if len(self.anim_times) > self.metrics_history:
-                        self.anim_times.pop(0)
-                    avg = sum(self.anim_times) / len(self.anim_times)
-                    self.lbl_anim_time.setText(f"Avg anim: {avg:.2f} ms")
+                    on_value(int(m.group(1)))
                 return
 
             # ─── drop face tags as before ───────────────────────────────
@@ -228,33 +236,68 @@ class AppWindow(QMainWindow):
 
             # ─── normal RX logging ──────────────────────────────────────
             # note: we bypass orig_log_recv so that
-            # only messages we want actually appear in the console
-            self.recv_console.appendPlainText(msg)
-            if self.autoscroll_recv:
-                sb = self.recv_console.verticalScrollBar()
-                sb.setValue(sb.maximum())
+            # only messages we want actually appear in the console.
+            # Lines are queued and flushed in batches by _flush_rx.
+            self._rx_pending.append(msg)
 
         serial_manager._log_recv = _filtered_log_recv
 
 
-
-        # Connect input
-        self.input_line.returnPressed.connect(self._on_enter)
-
-
         # Timers
-        self.step_timer = QTimer(self)
-        self.step_timer.timeout.connect(self._on_timer)
-        self.step_timer.start(5)
+        # bounded like the console itself: older lines would be dropped there anyway
+        self._rx_pending = deque(maxlen=config.CONSOLE_MAX_LINES)
+        self._rx_flush_timer = QTimer(self)
+        self._rx_flush_timer.timeout.connect(self._flush_rx)
+        self._rx_flush_timer.start(50)
+
+        # Joystick events (~60 Hz) and axis polling (UPDATES_PER_SEC)
+        self.event_timer = QTimer(self)
+        self.event_timer.timeout.connect(self._on_timer)
+        self.event_timer.start(16)
+
+        self.axis_timer = QTimer(self)
+        self.axis_timer.setTimerType(Qt.PreciseTimer)
+        self.axis_timer.timeout.connect(self.core.poll_axes)
+        self.axis_timer.start(int(1000 * config.AXIS_PERIOD))
+
+        # Serial: blocking reads happen in the reader thread, which wakes the
+        # GUI through rx_ready only when lines arrived; reconnect at 1 Hz
+        self.rx_ready.connect(self._on_rx_ready)
+        serial_manager.on_rx = self.rx_ready.emit
+        serial_manager.start_reader()
+        self.serial_timer = QTimer(self)
+        self.serial_timer.timeout.connect(serial_manager.try_reconnect)
+        self.serial_timer.start(1000)
+        serial_manager.try_reconnect()
 
         self.viewer_timer = QTimer(self)
         self.viewer_timer.timeout.connect(self._update_viewer)
-        self.viewer_timer.start(200)
+        self.viewer_timer.start(config.VIEWER_INTERVAL_MS)
+        self._viewer_cost_ema = 0.0     # smoothed parse+draw time (ms)
 
         # Viewer placeholder
         self.viewer = None
 
 
+    def _on_frametime(self, us: int):
+        val = us / 1000.0           # convert to milliseconds
+        if len(self.frame_times) == self.frame_times.maxlen:
+            self._frame_sum -= self.frame_times[0]
+        self.frame_times.append(val)
+        self._frame_sum += val
+        avg = self._frame_sum / len(self.frame_times)
+        self.lbl_frame_time.setText(f"Avg frame: {avg:.2f} ms")
+
+    def _on_animtime(self, us: int):
+        val = us / 1000.0           # convert to milliseconds
+        if len(self.anim_times) == self.anim_times.maxlen:
+            self._anim_sum -= self.anim_times[0]
+        self.anim_times.append(val)
+        self._anim_sum += val
+        avg = self._anim_sum / len(self.anim_times)
+        self.lbl_anim_time.setText(f"Avg anim: {avg:.2f} ms")
+
+
     def on_gyro_toggled(self, checked: bool):
         """Start or stop sending gyro data to the MCU."""
         self.btn_gyro.setText("Gyro On" if checked else "Gyro Off")
@@ -273,32 +316,46 @@ class AppWindow(QMainWindow):
             gyro_data = self.core.get_gyro()
         except AttributeError:
             # Core doesn’t implement get_gyro yet
-            self.on_gyro_toggled(False)
-            QMessageBox.warning(
-                self, "Gyro Error",
-                "ControllerCore.get_gyro() not implemented."
-            )
+            self._gyro_failed("Gyro Error", "ControllerCore.get_gyro() not implemented.")
             return
 
         if gyro_data is None:
-            QMessageBox.warning(self, "Warning", "No Gyro data available.")
-            self.on_gyro_toggled(False)
+            self._gyro_failed("Warning", "No Gyro data available.")
             return
 
-        x, y, z = gyro_data
-        cmd = f"#gyro x={x:+.3f},y={y:+.3f},z={z:+.3f}#"
+        cmd = _GYRO_FMT(*gyro_data)
         try:
             serial_manager.send(cmd)
         except Exception as e:
             # turn off on error
-            self.on_gyro_toggled(False)
-            QMessageBox.warning(
-                self, "Serial Error",
-                f"Failed to send gyro data:\n{e}"
-            )
+            self._gyro_failed("Serial Error", f"Failed to send gyro data:\n{e}")
+            return
+
+    def _gyro_failed(self, title: str, text: str):
+        """
+        Stop the gyro stream before the dialog, so the timer can't fire again
+        underneath it and stack popups.
+        """
+        self.btn_gyro.setChecked(False)   # → on_gyro_toggled(False), button shows the real state
+        QMessageBox.warning(self, title, text)
 
             
 
+    def _flush_rx(self):
+        """Append all queued RX lines in one go (one layout pass per tick)."""
+        if not self._rx_pending:
+            return
+        text = "\n".join(self._rx_pending)
+        self._rx_pending.clear()
+        self.recv_console.appendPlainText(text)
+        if self.autoscroll_recv:
+            self.recv_console.moveCursor(QTextCursor.End)
+
+    def _set_autoscroll_recv(self, enabled: bool):
+        self.autoscroll_recv = enabled
+        if enabled:
+            self.recv_console.moveCursor(QTextCursor.End)
+
     def _on_enter(self):
         cmd = self.input_line.text().strip()
         if cmd:
@@ -306,11 +363,30 @@ class AppWindow(QMainWindow):
             self.input_line.clear()
 
     def _update_viewer(self):
+        timer = QElapsedTimer()
+        timer.start()
+        self._apply_viewer_updates()
+        self._throttle_viewer(timer.elapsed())
+
+    def _throttle_viewer(self, elapsed: int):
+        """Stretch the viewer interval while updates are slow, relax it again after."""
+        self._viewer_cost_ema += 0.25 * (elapsed - self._viewer_cost_ema)
+        interval = self.viewer_timer.interval()
+        if elapsed > config.VIEWER_BUDGET_MS:
+            new_interval = min(config.VIEWER_MAX_INTERVAL_MS, 2 * elapsed)
+        elif self._viewer_cost_ema < config.VIEWER_BUDGET_MS / 2:
+            new_interval = max(config.VIEWER_INTERVAL_MS, interval * 3 // 4)
+        else:
+            return
+        if new_interval != interval:
+            self.viewer_timer.setInterval(new_interval)
+
+    def _apply_viewer_updates(self):
         if getattr(serial_manager, 'got_geometry', False): # is true if false
-            lines = serial_manager.buffer_lines
-            serial_manager.buffer_lines = []
+            buf = bytes(serial_manager.geometry_buf)
+            serial_manager.geometry_buf.clear()
             try:
-                V, H, E, F = _parse(lines)
+                V, H, E, F, face_len = _parse(buf)
             except Exception as exc:
                 logging.error(f"Parsing failed: {exc}")
                 serial_manager.got_geometry = False
@@ -324,9 +400,9 @@ class AppWindow(QMainWindow):
                 return
 
             if self.viewer is None:
-                self.viewer = Viewer(V, H, E, F, figure=self.canvas.figure)
+                self.viewer = Viewer(V, H, E, F, face_len, figure=self.canvas.figure)
             else:
-                self.viewer.update_geometry(lines)
+                self.viewer.update_geometry((V, H, E, F, face_len))
 
             serial_manager.got_geometry = False
 
@@ -337,13 +413,21 @@ class AppWindow(QMainWindow):
                 self.viewer.show_face(new_idx)
 
     def _on_timer(self):
-        self.core.step()
+        self.core.handle_events()
+
+    def _on_rx_ready(self):
+        serial_manager.process_rx_queue()
 
 
 
     def closeEvent(self, event):
-        self.step_timer.stop()
+        self._rx_flush_timer.stop()
+        self.event_timer.stop()
+        self.axis_timer.stop()
+        self.serial_timer.stop()
         self.viewer_timer.stop()
+        serial_manager.stop_reader()
+        serial_manager.on_rx = None
         self.core.shutdown()
         super().closeEvent(event)
 
@@ -47,6 +47,11 @@ RIGHT_TRIGGER       = 5 # Press/In (0 to 1)
 TRIGGER_SENSE       = 10
 TRIGGER_DEADZONE    = 0.05
 
+# derived per-update steps (computed once)
+STICK_STEP          = STICK_SENSE / UPDATES_PER_SEC
+TRIGGER_STEP        = TRIGGER_SENSE / UPDATES_PER_SEC
+AXIS_PERIOD         = 1.0 / UPDATES_PER_SEC
+
 #===========================================================
 
 
@@ -60,6 +65,13 @@ SLOW_RETRY = 10.0
 
 METRICS_HISTORY = 10
 
+CONSOLE_MAX_LINES = 5000    # scrollback cap for the TX/RX consoles
+
+# Viewer refresh: base interval, stretched when parse+draw exceeds the budget
+VIEWER_INTERVAL_MS     = 200
+VIEWER_MAX_INTERVAL_MS = 1000
+VIEWER_BUDGET_MS       = 100
+
 #===========================================================
 
 
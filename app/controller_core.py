@@ -8,10 +8,18 @@ import pygame
 import config
 import serial_manager
 
+
+def _jid(joy):
+    """Instance id of a joystick (pygame 2.x), falling back to get_id()."""
+    get_id = getattr(joy, 'get_instance_id', None) or joy.get_id
+    return get_id()
+
+
 class ControllerCore:
     """
-    Core logic for joystick and keyboard input, serial reconnect/drain,
-    sending commands based on mappings.
+    Core logic for joystick and keyboard input, sending commands based on
+    mappings. Serial reconnect/reading is driven by the AppWindow timers and
+    the serial_manager reader thread.
     """
     def __init__(self):
         logging.info("[info] Initializing ControllerCore...")
@@ -20,14 +28,23 @@ class ControllerCore:
         self._gyro = None   # placeholder for last‐read gyro tuple
         # Liste aller verbundenen Joysticks
         self.joysticks = []
+        self._joy_by_id = {}    # instance id → joystick, resolved once on connect
         self._init_joysticks()
 
         # Button-Debounce-/Repeat-State
-        self.btn_last = {btn: 0.0 for btn in config.JOYSTICK_BUTTON_MAPPING}
-        self.btn_repeat = {btn: False for btn in config.JOYSTICK_BUTTON_MAPPING}
+        # monotonic clock; -1e9 so the very first press always registers
+        self.btn_last = {btn: -1e9 for btn in config.JOYSTICK_BUTTON_MAPPING}
+        self.btn_held = set()   # (instance_id, button) currently pressed
 
-        # Zeit für nächstes Axis-Kommando
-        self.next_axis_time = 0.0
+        # Achsen-Mappings einmalig flach auflösen: (axis, cmd) / (axis, sign, cmd)
+        self._axis_table = tuple(
+            (axis, cmd) for cmd, axis in config.AXIS_MAPPING.items()
+        )
+        self._trigger_table = tuple(
+            (axis, sign, cmd)
+            for cmd, axis_list in config.TRIGGER_MAPPING.items()
+            for axis, sign in axis_list
+        )
 
         logging.info("[info] ControllerCore initialized.")
 
@@ -38,18 +55,23 @@ class ControllerCore:
             try:
                 joy = pygame.joystick.Joystick(idx)
                 joy.init()
-                self.joysticks.append(joy)
-                jid = getattr(joy, 'get_instance_id', joy.get_id)()
+                jid = self._add_joystick(joy)
                 logging.info(f"[info] Joystick '{joy.get_name()}' connected (instance {jid})")
             except Exception as e:
                 logging.error(f"[error] Failed to init joystick {idx}: {e}")
 
-    def step(self):
-        now = time.time()
+    def _add_joystick(self, joy):
+        jid = _jid(joy)
+        self.joysticks.append(joy)
+        self._joy_by_id[jid] = joy
+        return jid
 
-        # Serielle Verbindung: reconnect & drain
-        serial_manager.try_reconnect()
-        serial_manager.drain()
+    def handle_events(self):
+        """
+        Process pygame events: hot-plugging and button presses. Held buttons
+        auto-repeat every REPEAT_DELAY; only currently held buttons are checked.
+        """
+        now = time.monotonic()
 
         # Pygame Event-Handling
         try:
@@ -60,70 +82,79 @@ class ControllerCore:
             events = []
 
         for event in events:
-            if event.type == pygame.JOYDEVICEADDED:
+            if event.type == pygame.JOYBUTTONDOWN:
+                cmd = config.JOYSTICK_BUTTON_MAPPING.get(event.button)
+                if cmd is None:
+                    continue
+                btn = event.button
+                self.btn_held.add((event.instance_id, btn))
+                if now - self.btn_last[btn] >= config.DEBOUNCE_MS:
+                    serial_manager.send(cmd)
+                    self.btn_last[btn] = now
+            elif event.type == pygame.JOYBUTTONUP:
+                self.btn_held.discard((event.instance_id, event.button))
+            elif event.type == pygame.JOYDEVICEADDED:
                 idx = event.device_index
                 try:
                     joy = pygame.joystick.Joystick(idx)
                     joy.init()
-                    self.joysticks.append(joy)
-                    jid = getattr(joy, 'get_instance_id', joy.get_id)()
+                    jid = self._add_joystick(joy)
                     logging.info(f"[info] Joystick '{joy.get_name()}' connected (instance {jid})")
                 except Exception as e:
                     logging.error(f"[error] Could not add joystick at index {idx}: {e}")
             elif event.type == pygame.JOYDEVICEREMOVED:
                 inst = getattr(event, 'instance_id', None)
-                for joy in list(self.joysticks):
-                    jid = getattr(joy, 'get_instance_id', joy.get_id)()
-                    if jid == inst:
-                        logging.info(f"[info] Joystick '{joy.get_name()}' disconnected (instance {jid})")
-                        self.joysticks.remove(joy)
-                        break
-
-        try: 
-            for joy in self.joysticks:
-                for btn, cmd in config.JOYSTICK_BUTTON_MAPPING.items():
-                    try:
-                        pressed = joy.get_button(btn)
-                    except Exception:
-                        continue
-                    if pressed:
-                        delay = config.REPEAT_DELAY if self.btn_repeat[btn] else config.DEBOUNCE_MS
-                        if now - self.btn_last[btn] >= delay:
-                            serial_manager.send(cmd)
-                            self.btn_last[btn] = now
-                            self.btn_repeat[btn] = True
-                    else:
-                        self.btn_repeat[btn] = False
-
-            # Polling der Achsen für kontinuierliche Befehle
-            for joy in self.joysticks:
-                for cmd, axis in config.AXIS_MAPPING.items():
+                self.btn_held = {(i, b) for i, b in self.btn_held if i != inst}
+                joy = self._joy_by_id.pop(inst, None)
+                if joy is not None:
+                    logging.info(f"[info] Joystick '{joy.get_name()}' disconnected (instance {inst})")
+                    self.joysticks.remove(joy)
+
+        # Auto-repeat for held buttons
+        for _, btn in self.btn_held:
+            if now - self.btn_last[btn] >= config.REPEAT_DELAY:
+                serial_manager.send(config.JOYSTICK_BUTTON_MAPPING[btn])
+                self.btn_last[btn] = now
+
+        # ─── if the UI asked for gyro, sample & send it ─────────────────
+        if self.joysticks:
+            try:
+                self._gyro = None
+            except Exception:
+                pass
+
+    def poll_axes(self):
+        """
+        Poll sticks/triggers for continuous commands (call every AXIS_PERIOD).
+        The timer does the pacing; at most one command is sent per call.
+        """
+        stick_step = config.STICK_STEP
+        trigger_step = config.TRIGGER_STEP
+        stick_deadzone = config.STICK_DEADZONE
+        trigger_threshold = config.TRIGGER_DEADZONE / 2
+
+        # Polling der Achsen für kontinuierliche Befehle (pro Joystick,
+        # damit ein defektes Gerät die anderen nicht blockiert)
+        for joy in self.joysticks:
+            try:
+                for axis, cmd in self._axis_table:
                     try:
                         val = joy.get_axis(axis)
-                    except Exception:
+                    except pygame.error:
                         continue
-                    if abs(val) > config.STICK_DEADZONE and now >= self.next_axis_time:
-                        delta = val * (config.STICK_SENSE / config.UPDATES_PER_SEC)
+                    if abs(val) > stick_deadzone:
+                        delta = val * stick_step
                         serial_manager.send(f"{cmd} {delta:+.3f}")
-                        self.next_axis_time = now + 1.0 / config.UPDATES_PER_SEC
+                        return
 
-            for cmd, axis_list in config.TRIGGER_MAPPING.items():
-                for axis, sign in axis_list:
+                for axis, sign, cmd in self._trigger_table:
                     val = joy.get_axis(axis)
-                    if val > config.TRIGGER_DEADZONE/2 and now >= self.next_axis_time:
-                        delta = sign * val * (config.TRIGGER_SENSE / config.UPDATES_PER_SEC)
+                    if val > trigger_threshold:
+                        delta = sign * val * trigger_step
                         serial_manager.send(f"{cmd} {delta:+.3f}")
-                        self.next_axis_time = now + 1.0 / config.UPDATES_PER_SEC 
-
-        except: 
-            pass
-
-                # ─── if the UI asked for gyro, sample & send it ─────────────────
-        if self.joysticks:
-            try:
-                self._gyro = None
-            except:
-                pass
+                        return
+            except (AttributeError, pygame.error, IndexError) as e:
+                logging.debug("poll_axes: %s", e)
 
     def get_gyro(self):
         """
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 
-from matplotlib.backends.qt_compat import QtWidgets
+from matplotlib.backends.qt_compat import QtCore, QtWidgets
 
-import re, colorsys, time
+import re, colorsys, time, logging, warnings, itertools
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+from mpl_toolkits.mplot3d import proj3d
+from matplotlib.collections import Collection
 from matplotlib.widgets import Button
 
 
@@ -29,53 +31,134 @@ LABEL_FONT_SIZE = 16
 ZOOM_MARGIN    = 0.35   # smaller → more zoomed in (0.0…1.0)
 CAMERA_DIST    = 5     # lower → camera nearer → more dramatic perspective
 OPEN_WINDOW_SIZE = 6
-_hsv = lambda h: colorsys.hsv_to_rgb(h,1,1)
+# full-saturation RGB for every hue byte the MCU can send
+_HSV_LUT = np.array([colorsys.hsv_to_rgb(i / 255.0, 1, 1) for i in range(256)])
+
+
+# the dump stays bytes from the serial reader to here: no str per line/match
+_EDGE_RE      = re.compile(rb'\((\d+)-(\d+)\)')
+_VERT_STRIP   = b'() \t'            # "0,(x,y,z,h)" → "0,x,y,z,h"
+_VERT_SEP_RE  = re.compile(rb';+')
+
+
+def _numbers(text, dtype=float):
+    """Bulk-parse comma separated numbers in C; malformed input raises ValueError."""
+    with warnings.catch_warnings():
+        # numpy only warns (and truncates) on unparsable text → make it fatal
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=dtype, sep=',')
+        except DeprecationWarning as e:
+            raise ValueError(str(e)) from None
 
 
 def _parse(lines):
     """
     Parse a fresh geo-dump. Bei JEDEM Fehler: Exception werfen, damit das Modell
     komplett verworfen wird.
+    Vertex, edge and face sections are gathered first and decoded in one NumPy
+    pass each.
+    `lines` is the raw dump as one bytes/bytearray blob (as collected in
+    serial_manager.geometry_buf) or, for callers holding text, a list of str.
+    Faces come back as an int32 (n_faces, max_k) matrix padded with -1 plus
+    their lengths: face i is F[i, :face_len[i]].
     """
-    import re, logging
-    V, E, F, H = [], [], [], []
+    if isinstance(lines, (bytes, bytearray)):
+        lines = lines.splitlines()
+    else:
+        lines = [line.encode() for line in lines]
+    v_parts, e_lines, f_parts = [], [], []
 
     for line in lines:
-        if line.startswith('V:'):
-            parts = line[2:].strip().split(';')
-            for part in parts:
-                part = part.strip()
-                if not part:
-                    continue
-                # Verteces: (x,y,z,h)
-                try:
-                    _, rest = part.split(',', 1)
-                    x, y, z, h = map(float, rest.strip('()').split(','))
-                    V.append((x, y, z))
-                    H.append(h / 255.0)
-                except ValueError as e:
-                    logging.error(f"Vertex parsing error: {e} in part: {part}")
-                    # sofort abbrechen
-                    raise
-
-        elif line.startswith('E:'):
-            # Nur saubere (a-b)-Paare extrahieren
-            for a_str, b_str in re.findall(r'\((\d+)-(\d+)\)', line):
-                E.append((int(a_str), int(b_str)))
-            # Wenn keine Paare gefunden wurden, war der Dump kaputt → abort
-            if not E:
-                raise ValueError(f"No valid edge pairs in line: {line!r}")
-
-        elif line.startswith('f'):
+        if line.startswith(b'V:'):
+            v_parts.append(line[2:])
+        elif line.startswith(b'E:'):
+            e_lines.append(line)
+        elif line.startswith(b'f'):
             try:
-                idxs = line.split(':', 1)[1]
-                verts = [int(i) for i in idxs.strip().strip(',').split(',') if i]
-                F.append(verts)
-            except ValueError as e:
+                f_parts.append(line.split(b':', 1)[1].strip().strip(b','))
+            except IndexError as e:
                 logging.error(f"Face parsing error: {e} in line: {line}")
                 raise
 
-    return np.array(V), np.array(H), np.array(E), F
+    # Verteces: "idx,(x,y,z,h);idx,(x,y,z,h);…"
+    V, H = np.empty((0, 3)), np.empty(0, dtype=np.uint8)
+    if v_parts:
+        blob = _VERT_SEP_RE.sub(b',', b';'.join(v_parts).translate(None, _VERT_STRIP)).strip(b',')
+        try:
+            vals = _numbers(blob)
+            if vals.size % 5:
+                raise ValueError(f"expected idx,(x,y,z,h) groups, got {vals.size} values")
+        except ValueError as e:
+            logging.error(f"Vertex parsing error: {e}")
+            # sofort abbrechen
+            raise
+        vals = vals.reshape(-1, 5)
+        V = vals[:, 1:4].copy()         # contiguous for the V[E] gathers later
+        H = np.clip(vals[:, 4], 0, 255).astype(np.uint8)   # hue byte → _HSV_LUT index
+
+    # Nur saubere (a-b)-Paare extrahieren
+    E = np.empty((0, 2), dtype=np.int32)
+    if e_lines:
+        pairs = _EDGE_RE.findall(b''.join(e_lines))
+        # Wenn keine Paare gefunden wurden, war der Dump kaputt → abort
+        if not pairs:
+            raise ValueError(f"No valid edge pairs in line: {e_lines[0]!r}")
+        # groups are plain digits → one C-level parse of "a,b,a,b,…"
+        E = _numbers(b','.join(itertools.chain.from_iterable(pairs)), np.int32).reshape(-1, 2)
+
+    # Faces: "fN: a,b,c,…" → all indices in one pass, scattered into the rows
+    F = np.full((0, 0), -1, dtype=np.int32)
+    face_len = np.zeros(0, dtype=np.int32)
+    if f_parts:
+        face_len = np.array([p.count(b',') + 1 if p else 0 for p in f_parts], dtype=np.int32)
+        try:
+            flat = _numbers(b','.join(p for p in f_parts if p), np.int32)
+            if flat.size != face_len.sum():
+                raise ValueError(f"expected {face_len.sum()} face indices, got {flat.size}")
+        except ValueError as e:
+            logging.error(f"Face parsing error: {e}")
+            raise
+        F = np.full((len(face_len), face_len.max()), -1, dtype=np.int32)
+        F[np.arange(F.shape[1]) < face_len[:, None]] = flat   # row-major = dump order
+
+    return V, H, E, F, face_len
+
+
+def _half_segments(V, a, b):
+    """
+    Split every edge a[i]→b[i] at its midpoint (for the two-colour gradient).
+    Returns a (2N, 2, 3) array: rows 2i = [A, M], 2i+1 = [M, B].
+    """
+    A, B = V[a], V[b]
+    M = 0.5 * (A + B)
+    segs = np.empty((2 * len(A), 2, 3))
+    segs[0::2, 0] = A
+    segs[0::2, 1] = M
+    segs[1::2, 0] = M
+    segs[1::2, 1] = B
+    return segs
+
+
+def _limits(V):
+    """Bounding-box centre and view radius of V (one min and one max pass)."""
+    mn, mx = V.min(0), V.max(0)
+    return (mn + mx) * 0.5, (mx - mn).max() * ZOOM_MARGIN
+
+
+class _FaceCollection(Poly3DCollection):
+    """
+    All faces in one collection. Against the other artists it sorts by the
+    visible face only (depth_verts), like a lone per-face patch would –
+    otherwise the transparent faces would pull it to the front.
+    """
+    depth_verts = None
+
+    def do_3d_projection(self):
+        z = super().do_3d_projection()
+        if self.depth_verts is None or not len(self.depth_verts):
+            return z
+        return np.min(proj3d.proj_transform(*self.depth_verts.T, self.axes.M)[2])
 
 
 # ── viewer ────────────────────────────────────────────────────────────────
@@ -85,12 +168,15 @@ class Viewer:
     
     def draw(self):
         self.fig.canvas.draw_idle()
-        self.fig.canvas.flush_events()
+        # embedded in the Qt app the event loop renders the idle draw itself;
+        # pumping events here would only re-enter the GUI loop
+        if not self._embedded:
+            self.fig.canvas.flush_events()
         self._last_draw = time.time()  
 
-    def __init__(self, V, H, E, F, figure=None):
+    def __init__(self, V, H, E, F, face_len, figure=None):
         # Model data and initial states
-        self.V, self.H, self.E, self.F = V, H, E, F
+        self.V, self.H, self.E, self.F, self.face_len = V, H, E, F, face_len
         self.mode = 'single'
         self.labels_on = True
         self.current_face = 0
@@ -100,8 +186,12 @@ class Viewer:
         self._last_x = None
         self._last_y = None
         self._last_draw = 0
+        self._redraw_pending = False   # drag redraw already queued on the Qt loop
+        self._bg = None         # cached background while dragging
+        self._dynamic = []      # artists blitted on top of it
 
         # either embed into your Qt FigureCanvas, or fall back to a new window
+        self._embedded = figure is not None
         if figure is None:
             #plt.ion()
             self.fig = plt.figure('MCU poly', figsize=(OPEN_WINDOW_SIZE, OPEN_WINDOW_SIZE))
@@ -123,39 +213,14 @@ class Viewer:
         ax.dist = CAMERA_DIST
 
 
-        # Calculate center and radius for axis limits
-        if V.size == 0:
-            # Leeres Array: Default-Werte verwenden
-            center = np.array([0.0, 0.0, 0.0])
-            radius = 1.0  # Fallback-Radius, um Division durch Null zu vermeiden
-        else:
-            # Normale Berechnung, wenn V nicht leer ist
-            center = V.mean(0)
-            radius = np.ptp(V, 0).max() * ZOOM_MARGIN
-
-        ax.set_xlim(center[0] - radius, center[0] + radius)
-        ax.set_ylim(center[1] - radius, center[1] + radius)
-        ax.set_zlim(center[2] - radius, center[2] + radius)
-
-        # Axis arrows (X, Y, Z) with labels
-        axis_length = radius * AXIS_LEN_FACTOR
-        axis_opacity = AXIS_OPACITY  # 50% opacity (alpha)
-
-        # Define axis vectors and labels (consistent lengths and positioning)
-        axes = [
-            ((axis_length, 0, 0), 'r', 'X'),
-            ((0, axis_length, 0), 'g', 'Y'),
-            ((0, 0, axis_length), 'b', 'Z')
-        ]
-
-        # Plot axis arrows and labels with 50% opacity
-        for vector, color, label in axes:
-            ax.quiver(0, 0, 0, *vector, color=color, lw=2, alpha=axis_opacity)
-            ax.text(*vector, label, color=color, alpha=axis_opacity, ha='center', va='center', zdir='z')
-
         # Store figure and axis
         self.fig, self.ax = fig, ax
 
+        # Axis limits + axis arrows (X, Y, Z) with labels
+        self._axis_artists = []
+        self._axis_radius = None
+        self._apply_limits()
+
         # Build 3D collections (wires, faces, labels)
         self._build_collections()
 
@@ -193,19 +258,15 @@ class Viewer:
         ax = self.ax
 
         # Grey wireframe (static)
-        wires = [[V[a], V[b]] for a, b in E]
-        ax.add_collection3d(Line3DCollection(wires, colors=[GREY], lw=LINE_W/3))
+        wires = V[E]
+        self.wire_coll = ax.add_collection3d(Line3DCollection(wires, colors=[GREY], lw=LINE_W/3))
 
         # Vertex points
-        ax.scatter(V[:, 0], V[:, 1], V[:, 2], color=[GREY], s=12, depthshade=True)
+        self.points = ax.scatter(V[:, 0], V[:, 1], V[:, 2], color=[GREY], s=12, depthshade=True)
 
         # Colored edges (dynamic)
-        segsC, colsC = [], []
-        for a, b in E:
-            A, B = V[a], V[b]
-            M = (A + B) / 2  # Midpoint for gradient effect
-            segsC += [[A, M], [M, B]]
-            colsC += [_hsv(H[a]), _hsv(H[b])]
+        segsC = _half_segments(V, E[:, 0], E[:, 1])   # midpoint gradient
+        colsC = _HSV_LUT[H[np.ravel(E)]]   # a0, b0, a1, b1, … per half-segment
         self.full_coll = ax.add_collection3d(
             Line3DCollection(segsC, colors=colsC, lw=LINE_W)
         )
@@ -216,29 +277,90 @@ class Viewer:
             Line3DCollection(dummy, colors=[GREY], lw=LINE_W * 3, zorder=2)
         )
 
-        # Wir legen für jedes Face einen eigenen Poly3DCollection-Patch an:
-        self.face_patches = []
-        for vs in self.F:
-            if vs is None:
-                self.face_patches.append(None)
-                continue
-            verts = [self.V[v] for v in vs]
-            poly = Poly3DCollection(
-                [verts],
-                facecolors=(1,1,1,SINGLE_ALPHA),
-                edgecolors=None,
-                zsort='average',
-                axlim_clip=False,
-                zorder=1
-            )
-            poly.set_visible(False)
-            ax.add_collection3d(poly)
-            self.face_patches.append(poly)
-
-        # Placeholder for vertex labels
-        self.lbl = []
-        # Damit self.patch überall weiter existiert:
-        self.patch = self.face_patches[0]  # oder None, falls F[0] == None
+        # Alle Faces in EINER Poly3DCollection (ein Depth-Sort pro Draw);
+        # sichtbar ist nur das Face, dessen Alpha in _face_colors > 0 ist
+        self._face_colors = np.zeros((len(self.F), 4))
+        self._face_colors[:, :3] = 1
+        self._face_idx = self._pad_faces()
+        self.all_faces = _FaceCollection(
+            V[self._face_idx],
+            facecolors=self._face_colors,
+            edgecolors=None,
+            zsort='average',
+            axlim_clip=False,
+            zorder=1
+        )
+        ax.add_collection3d(self.all_faces)
+
+        # Pool wiederverwendbarer Vertex-Labels (wächst bei Bedarf)
+        self._label_pool = []
+        self._labels_used = 0
+        self._topology_sig = (len(V), len(E), len(self.F))
+
+    def _update_collections(self):
+        """Refresh the existing collections from self.V/H/E/F (same artist counts)."""
+        V, H, E = self.V, self.H, self.E
+        self.wire_coll.set_segments(V[E])
+        self.points._offsets3d = (V[:, 0], V[:, 1], V[:, 2])
+        self.full_coll.set_segments(_half_segments(V, E[:, 0], E[:, 1]))
+        self.full_coll.set_color(_HSV_LUT[H[np.ravel(E)]])
+        self._face_idx = self._pad_faces()
+        self.all_faces.set_verts(V[self._face_idx])
+
+    def _face(self, idx):
+        """Vertex indices of face `idx` (a view into the padded F matrix)."""
+        return self.F[idx, :self.face_len[idx]]
+
+    def _pad_faces(self):
+        """
+        F with the -1 padding replaced by each face's last vertex. The repeated
+        points add no area, but give all_faces one uniform (n_faces, max_k, 3)
+        block, so mplot3d projects it without the masked ragged-polygon path.
+        """
+        last = self.F[np.arange(len(self.F)), np.maximum(self.face_len - 1, 0)]
+        last = np.where(self.face_len > 0, last, 0)   # empty face → one dot at V0
+        return np.where(self.F >= 0, self.F, last[:, None])
+
+    def _apply_limits(self):
+        """Fit the axis limits to self.V, redraw the axis arrows if the size changed."""
+        V, ax = self.V, self.ax
+        # Calculate center and radius for axis limits
+        if V.size == 0:
+            # Leeres Array: Default-Werte verwenden
+            center = np.array([0.0, 0.0, 0.0])
+            radius = 1.0  # Fallback-Radius, um Division durch Null zu vermeiden
+        else:
+            # Normale Berechnung, wenn V nicht leer ist
+            center, radius = _limits(V)
+
+        ax.set_xlim(center[0] - radius, center[0] + radius)
+        ax.set_ylim(center[1] - radius, center[1] + radius)
+        ax.set_zlim(center[2] - radius, center[2] + radius)
+
+        if radius == self._axis_radius:
+            return
+        for art in self._axis_artists:
+            art.remove()
+        self._axis_artists = []
+        self._axis_radius = radius
+
+        # Axis arrows (X, Y, Z) with labels
+        axis_length = radius * AXIS_LEN_FACTOR
+        axis_opacity = AXIS_OPACITY  # 50% opacity (alpha)
+
+        # Define axis vectors and labels (consistent lengths and positioning)
+        axes = [
+            ((axis_length, 0, 0), 'r', 'X'),
+            ((0, axis_length, 0), 'g', 'Y'),
+            ((0, 0, axis_length), 'b', 'Z')
+        ]
+
+        # Plot axis arrows and labels with 50% opacity
+        for vector, color, label in axes:
+            self._axis_artists.append(
+                ax.quiver(0, 0, 0, *vector, color=color, lw=2, alpha=axis_opacity))
+            self._axis_artists.append(
+                ax.text(*vector, label, color=color, alpha=axis_opacity, ha='center', va='center', zdir='z'))
 
     def _on_focus(self, event):
         """Event triggered when the window gains focus."""
@@ -255,14 +377,69 @@ class Viewer:
             # correctly initialize both coords
             self._last_x = event.x
             self._last_y = event.y
+            self._start_blit()
 
     def _on_release(self, event):
         if event.button == 1:
             self._drag = False
+            self.ax.view_init(elev=self.ax.elev, azim=self.ax.azim)
+            self._end_blit()
             self.draw()
 
+    # ── drag rendering: static background + blitted 3D artists ───────────
+    # Rotating moves every 3D artist, so all of them are animated while
+    # dragging; only the axes background and the buttons end up in the cache.
+
+    def _start_blit(self):
+        canvas = self.fig.canvas
+        if not getattr(canvas, 'supports_blit', False):
+            return
+        # in child order, so zorder ties break like in Axes3D.draw
+        dyn = {*self.ax.collections, *self.ax.texts}
+        self._dynamic = [a for a in self.ax.get_children() if a in dyn and a.get_visible()]
+        for art in self._dynamic:
+            art.set_animated(True)
+            # cheaper rasterisation while the view moves (restored on release)
+            if isinstance(art, Line3DCollection):
+                art.set_antialiased(False)
+        canvas.draw()
+        # whole figure: labels are unclipped and may leave the (aspect-shrunk) axes box
+        self._bg = canvas.copy_from_bbox(self.fig.bbox)
+
+    def _end_blit(self):
+        for art in self._dynamic:
+            art.set_animated(False)
+            if isinstance(art, Line3DCollection):
+                art.set_antialiased(True)
+        self._dynamic = []
+        self._bg = None
+
+    def _blit(self):
+        """Re-project and draw only the 3D artists over the cached background."""
+        canvas, ax = self.fig.canvas, self.ax
+        if self._bg is None:
+            canvas.draw_idle()
+            return
+        # same projection + depth zorders Axes3D.draw() sets up; draw_artist
+        # skips both. Collections go far → near above the axes, texts keep
+        # their own zorder and get interleaved with them
+        ax.M = ax.get_proj()
+        ax.invM = np.linalg.inv(ax.M)
+        colls = [a for a in self._dynamic if isinstance(a, Collection)]
+        if ax.computed_zorder:
+            zorder = max(axis.get_zorder() for axis in (ax.xaxis, ax.yaxis, ax.zaxis)) + 1
+            for art in sorted(colls, key=lambda a: a.do_3d_projection(), reverse=True):
+                art.zorder = zorder
+                zorder += 1
+        else:
+            for art in colls:
+                art.do_3d_projection()
+        canvas.restore_region(self._bg)
+        for art in sorted(self._dynamic, key=lambda a: a.get_zorder()):
+            ax.draw_artist(art)
+        canvas.blit(self.fig.bbox)
+
     def _on_motion(self, event):
-        now = time.time() 
         # bail out if we haven’t started a drag or moved outside the axes
         if not self._drag or event.inaxes is not self.ax or not self._focused:
         #if not self._focused or not self._drag:
@@ -288,51 +465,58 @@ class Viewer:
         new_az = self.ax.azim - dx * 0.15
         new_el = self.ax.elev - dy * 0.15
         new_el = max(-ELEV_LIMIT, min(ELEV_LIMIT, new_el))
-        # lock the “up” vector by using view_init
-        self.ax.view_init(elev=new_el, azim=new_az)
+        # set the angles directly (no view_init reset per event), roll stays 0
+        # to lock the “up” vector; _on_release syncs through view_init once
+        self.ax.azim, self.ax.elev, self.ax.roll = new_az, new_el, 0
         # update for next motion event
         self._last_x = event.x
         self._last_y = event.y
 
 
-        # throttle redraw to REDRAW_DELAY
-        #if now - self._last_draw > REDRAW_DELAY:
-        #self.draw()
+        # throttle redraw to REDRAW_DELAY: the first motion queues one blit,
+        # later ones only move the camera until it has run
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            QtCore.QTimer.singleShot(int(REDRAW_DELAY * 1000), self._do_redraw)
 
-        if now < self._last_draw + REDRAW_DELAY:
-            return
-        
-        #self.fig.canvas.draw_idle()
-        self.fig.canvas.flush_events()
-        self._last_draw = time.time()  
+    def _do_redraw(self):
+        self._redraw_pending = False
+        if self._drag:   # released meanwhile → _on_release already drew
+            self._blit()
 
 
 
 
     def _clear_labels(self):
-        """Remove all existing vertex labels from the plot."""
-        for label in self.lbl:
-            label.remove()
-        self.lbl.clear()
-
-    def _add_label(self, idx, pos):
-        """Add a vertex label that always sits in front of everything."""
-        label = self.ax.text(
-            *pos, f'V{idx}',
-            color='w',
-            fontsize=LABEL_FONT_SIZE,
-            ha='center', va='center',
-            visible=self.labels_on,
-            zorder=999,       # draw last
-            clip_on=False     # don’t clip against axes
-        )
-        self.lbl.append(label)
+        """Hide all vertex labels (the Text artists stay in the pool)."""
+        for label in self._label_pool[:self._labels_used]:
+            label.set_visible(False)
+        self._labels_used = 0
+
+    def _show_labels(self, indices):
+        """Show 'V<i>' labels for the given vertices, reusing pooled Text artists."""
+        pool = self._label_pool
+        while len(pool) < len(indices):
+            pool.append(self.ax.text(
+                0, 0, 0, '',
+                color='w',
+                fontsize=LABEL_FONT_SIZE,
+                ha='center', va='center',
+                visible=False,
+                zorder=999,       # draw last
+                clip_on=False     # don’t clip against axes
+            ))
+        for label, vertex in zip(pool, indices):
+            label.set_position_3d(self.V[vertex] * LABEL_OFFSET)
+            label.set_text(f'V{vertex}')
+            label.set_visible(self.labels_on)
+        for label in pool[len(indices):self._labels_used]:
+            label.set_visible(False)
+        self._labels_used = len(indices)
 
     def _make_face_labels(self, idx):
-        """Clear existing labels and create new ones for the active face."""
-        self._clear_labels()
-        for vertex in self.F[idx]:
-            self._add_label(vertex, self.V[vertex] * LABEL_OFFSET)
+        """Show labels for the vertices of the active face."""
+        self._show_labels(self._face(idx))
 
     def _swap_mode(self, _):
         """Toggle between 'full' and 'single' view modes."""
@@ -342,7 +526,6 @@ class Viewer:
         # Update visibility based on mode
         self.full_coll.set_visible(self.mode == 'full')
         self.active_coll.set_visible(self.mode == 'single')
-        self.patch.set_visible(True)
 
         # Clear old labels before switching modes
         self._clear_labels()
@@ -350,8 +533,7 @@ class Viewer:
         # Rebuild labels for current mode if enabled
         if self.labels_on:
             if self.mode == 'full':
-                for i, pos in enumerate(self.V):
-                    self._add_label(i, pos * LABEL_OFFSET)
+                self._show_labels(range(len(self.V)))
             else:
                 self._make_face_labels(self.current_face)
 
@@ -367,8 +549,7 @@ class Viewer:
         # Clear or rebuild labels based on the current mode and flag
         if self.labels_on:
             if self.mode == 'full':
-                for i, pos in enumerate(self.V):
-                    self._add_label(i, pos * LABEL_OFFSET)
+                self._show_labels(range(len(self.V)))
             else:
                 self._make_face_labels(self.current_face)
         else:
@@ -378,7 +559,7 @@ class Viewer:
 
     def show_face(self, idx, *, first=False):
         # 1) Gültigkeit prüfen
-        if idx < 0 or idx >= len(self.F) or self.F[idx] is None:
+        if idx < 0 or idx >= len(self.F):
             return
 
         # 2) Falls gerade Drag, auf später verschieben
@@ -389,28 +570,21 @@ class Viewer:
         if not first and idx == getattr(self, 'current_face', None):
             return
 
-        # 4) Alte Labels und alle Face-Patches ausblenden
+        # 4) Alte Labels ausblenden
         self._clear_labels()
-        for poly in self.face_patches:
-            if poly:
-                poly.set_visible(False)
-
-        # 5) Gewünschtes Face einblenden
-        patch = self.face_patches[idx]
-        patch.set_visible(True)
-        self.patch = patch
+
+        # 5) Gewünschtes Face einblenden: nur dessen Alpha > 0
+        self._face_colors[:, 3] = 0
+        self._face_colors[idx, 3] = SINGLE_ALPHA
+        self.all_faces.set_facecolor(self._face_colors)
+        self.all_faces.depth_verts = self.V[self._face(idx)]
         self.current_face = idx
 
         # 6) “Active” Kanten für dieses Face neu berechnen
-        vs   = self.F[idx]
-        segs = []
-        cols = []
-        cyc  = vs[1:] + vs[:1]
-        for a, b in zip(vs, cyc):
-            A, B = self.V[a], self.V[b]
-            M     = (A + B) / 2
-            segs += [[A, M], [M, B]]
-            cols += [_hsv(self.H[a]), _hsv(self.H[b])]
+        vs   = self._face(idx)
+        cyc  = np.roll(vs, -1)
+        segs = _half_segments(self.V, vs, cyc)
+        cols = _HSV_LUT[self.H[np.column_stack((vs, cyc)).ravel()]]
 
         self.active_coll.set_segments(segs)
         self.active_coll.set_color(cols)
@@ -427,67 +601,68 @@ class Viewer:
 
 
 
-    def update_geometry(self, lines):
+    def update_geometry(self, geometry):
         """
-        Parse and rebuild geometry from a fresh dump, preserving mode and face,
-        then redraw axis arrows without the surrounding box grid.
+        Rebuild geometry from a fresh dump, preserving mode and face, then
+        redraw axis arrows without the surrounding box grid.
+        `geometry` is either the (V, H, E, F, face_len) tuple returned by _parse or the
+        raw dump lines (parsed here).
         """
         import logging
 
-        # 1) Parse dump in temp; on error, keep old geometry
-        try:
-            V_new, H_new, E_new, F_new = _parse(lines)
-        except Exception as exc:
-            logging.error(f"update_geometry: parse error, keeping old geometry: {exc}")
-            return
+        # 1) Parse dump in temp (unless already parsed); on error, keep old geometry
+        if isinstance(geometry, tuple):
+            V_new, H_new, E_new, F_new, L_new = geometry
+        else:
+            try:
+                V_new, H_new, E_new, F_new, L_new = _parse(geometry)
+            except Exception as exc:
+                logging.error(f"update_geometry: parse error, keeping old geometry: {exc}")
+                return
 
         # 2) Sanitize edges/faces
         maxv = len(V_new)
-        E_new = np.array([(a,b) for (a,b) in E_new if 0<=a<maxv and 0<=b<maxv], dtype=int)
-        F_new = [vs for vs in F_new if all(0<=v<maxv for v in vs)]
-
-        # 3) Remove old collections and previous arrows/texts to avoid stacking
-        for coll in list(self.ax.collections):
-            coll.remove()
-        # also remove any artists (e.g., quiver arrows) and text labels
-        for art in list(self.ax.artists):
-            art.remove()
-        for txt in list(self.ax.texts):
-            txt.remove()
-
-        # 4) Update state
-        self.V, self.H, self.E, self.F = V_new, H_new, E_new, F_new
-
-        # 5) Rebuild collections and preserve mode
-        self._build_collections()
+        E_new = np.asarray(E_new, dtype=int).reshape(-1, 2)
+        E_new = E_new[((E_new >= 0) & (E_new < maxv)).all(axis=1)]
+        used = np.arange(F_new.shape[1]) < L_new[:, None]   # padding is always valid
+        keep = (~used | ((F_new >= 0) & (F_new < maxv))).all(axis=1)
+        F_new, L_new = F_new[keep], L_new[keep]
+
+        # a rebuild mid-drag would invalidate the blit cache
+        self._end_blit()
+
+        # 3) Same artist counts → update the existing collections in place;
+        #    otherwise tear everything down and rebuild
+        same_topology = (len(V_new), len(E_new), len(F_new)) == self._topology_sig
+        self.V, self.H, self.E, self.F, self.face_len = V_new, H_new, E_new, F_new, L_new
+        if same_topology:
+            self._update_collections()
+        else:
+            # Remove old collections and previous arrows/texts to avoid stacking
+            for coll in list(self.ax.collections):
+                coll.remove()
+            # also remove any artists (e.g., quiver arrows) and text labels
+            for art in list(self.ax.artists):
+                art.remove()
+            for txt in list(self.ax.texts):
+                txt.remove()
+            self._axis_artists = []
+            self._axis_radius = None
+
+            # Rebuild collections and preserve mode
+            self._build_collections()
         self.full_coll.set_visible(self.mode=='full')
         self.active_coll.set_visible(self.mode=='single')
 
-        # 6) Show current face
+        # 4) Show current face
         idx = getattr(self, 'current_face', 0)
         if not (0<=idx<len(self.F)):
             idx = 0
             self.current_face = 0
         self.show_face(idx, first=True)
 
-        # 7) Axis arrows: recalc limits then draw arrows and labels
-        center = self.V.mean(axis=0) if self.V.size else np.array([0.0,0.0,0.0])
-        radius = np.ptp(self.V,0).max()*ZOOM_MARGIN if self.V.size else 1.0
-        # set axis limits to preserve view
-        self.ax.set_xlim(center[0]-radius, center[0]+radius)
-        self.ax.set_ylim(center[1]-radius, center[1]+radius)
-        self.ax.set_zlim(center[2]-radius, center[2]+radius)
-        # draw semi-transparent axis arrows
-        axis_len = radius * AXIS_LEN_FACTOR
-        opacity  = AXIS_OPACITY
-        for vec, col, lbl in [
-            ((axis_len,0,0),'r','X'),
-            ((0,axis_len,0),'g','Y'),
-            ((0,0,axis_len),'b','Z')
-        ]:
-            self.ax.quiver(0,0,0,*vec, color=col, lw=2, alpha=opacity)
-            self.ax.text(*vec, lbl, color=col, alpha=opacity,
-                         ha='center', va='center', zdir='z')
-
-        # 8) Final redraw
+        # 5) Axis limits; arrows are redrawn only if the radius changed
+        self._apply_limits()
+
+        # 6) Final redraw
         #self.draw()
@@ -1,16 +1,19 @@
 """serial_manager.py - handles USB/serial I/O, geo-dump routing and central logging
 -------------------------------------------------------------------------------
 Responsibilities
-* reconnect loop with back-off
+* reconnect loop with back-off; automatically issues a #dumpgeo# once after
+  (re)connect when no geometry
 * send() helper that logs every outbound command (tagged [sent])
-* drain() that:
+* background reader thread (start_reader()) feeding rx_queue;
+  process_rx_queue() then, on the GUI thread, woken via the on_rx callback
+  only when something arrived (no polling):
     - logs every inbound line (tagged [recv])
     - optional hide/filter for #noprefix# sections or regex masks
-    - automatically issues a #dumpgeo# once after (re)connect when no geometry
-* viewer bridge for live geometry (#geo# … #endgeo#) via debug_viewer.py
+* live geometry (#geo# … #endgeo#) collected as raw bytes in geometry_buf;
+  the embedded viewer picks it up in-process (no pipe, no re-encoding)
 * public helper toggle_hidden() to switch visibility of filtered traffic
 """
-import sys, time, subprocess, tempfile, os, re, logging
+import sys, time, tempfile, os, re, logging, threading, queue
 from pathlib import Path
 
 import serial, serial.tools.list_ports
@@ -37,13 +40,10 @@ logging.basicConfig(
 ser               = None          #   serial.Serial instance
 retry_interval    = config.FAST_RETRY
 last_reconnect    = 0.0
-recv_buffer       = b""           #   unparsed bytes stash
-
-viewer_proc       = None          #   debug_viewer.py process
-viewer_in         = None          #   its stdin
+recv_buffer       = bytearray()   #   unparsed bytes stash
 
 collecting        = False         #   inside #geo# … #endgeo#
-buffer_lines      = []
+geometry_buf      = bytearray()   #   raw geo-dump lines, LF-joined
 active_name       = "viewer"
 
 got_geometry      = False         #   at least one geo dump seen?
@@ -54,6 +54,12 @@ show_hidden       = False         #   runtime toggle for filtered traffic
 
 connect_time      = 0
 sent_dump_request = False
+
+reader_thread     = None          #   background serial reader
+rx_queue          = queue.Queue() #   lines (or read errors) from the reader
+_reader_stop      = threading.Event()
+on_rx             = None          #   callable(), fired from the reader thread
+_rx_notified      = threading.Event()   # on_rx fired, queue not drained yet
 # pattern to decide whether to hide a line when show_hidden is False
 HIDE_RE = re.compile(r"^#.*#$")   #  lines enclosed in #...#  (incl. noprefix zones)
 
@@ -74,7 +80,10 @@ def _log_sent(cmd: str):
 
 def _should_hide(text: str) -> bool:
     """Return True if line belongs to a hidden category."""
-    return map_dump_mode or bool(HIDE_RE.match(text))
+    # cheap first/last-char check keeps ordinary lines out of the regex engine
+    return map_dump_mode or (
+        text[:1] == "#" and text[-1:] == "#" and HIDE_RE.match(text) is not None
+    )
 
 
 # ── public API ────────────────────────────────────────────────────────────
@@ -146,104 +155,175 @@ def send(cmd: str):
         close_serial()
 
 
-# ── geometry viewer bridge ────────────────────────────────────────────────
+# ── inbound stream: line split + meta-tags ────────────────────────────────
 
-def _viewer_send(packet):
-    """Ensure debug_viewer.py is running, stream packet(s) to stdin."""
-    global viewer_proc, viewer_in
-    if viewer_proc is None or viewer_proc.poll() is not None:
-        try:
-            viewer_proc = subprocess.Popen(
-                [sys.executable, "debug_viewer.py"],
-                text=True, stdin=subprocess.PIPE, close_fds=True,
-            )
-            viewer_in = viewer_proc.stdin
-            logging.info(Fore.YELLOW + "[viewer] debug window started")
-        except Exception as e:
-            logging.error("[viewer error] %s", e)
-            viewer_proc = viewer_in = None
+def _read_lines(port):
+    """Read pending bytes from `port`, return the complete CR/LF-terminated lines (raw bytes)."""
+    global recv_buffer
+
+    data = port.read(port.in_waiting or 1)
+    if not data:
+        return []
+    recv_buffer += data
+    # cut at the last terminator; the tail stays buffered for the next read
+    end = max(recv_buffer.rfind(b"\n"), recv_buffer.rfind(b"\r")) + 1
+    if not end:
+        return []
+    complete = bytes(recv_buffer[:end])
+    del recv_buffer[:end]
+    return [line for line in complete.splitlines() if line]
+
+
+# Meta-tag handlers: each returns True when it consumed the line, False to
+# let it fall through to the normal collect/log path.
+
+def _h_noprefix(text: str) -> bool:
+    # Handle noprefix sections (raw passthrough, hidden by default)
+    global map_dump_mode
+    if text != "#noprefix#":
+        return False
+    map_dump_mode = True
+    _log_recv(text)
+    return True
+
+
+def _h_endnoprefix(text: str) -> bool:
+    global map_dump_mode
+    if text != "#endnoprefix#" or not map_dump_mode:
+        return False
+    _log_recv(text)
+    map_dump_mode = False
+    return True
+
+
+def _h_geo(text: str) -> bool:
+    # Geometry stream start
+    global collecting
+    if map_dump_mode:
+        return False
+    collecting = True
+    geometry_buf.clear()
+    geometry_buf.extend(text.encode() + b"\n")
+    _log_recv(text)
+    return True
+
+
+def _h_endgeo(text: str) -> bool:
+    # End of geometry
+    global collecting, got_geometry
+    if map_dump_mode or not collecting:
+        return False
+    geometry_buf.extend(text.encode() + b"\n")
+    collecting = False
+    got_geometry = True
+    _log_recv(text)
+    return True
+
+
+def _h_face(text: str) -> bool:
+    # Face selection
+    global pending_face
+    if map_dump_mode:
+        return False
+    # Merke dir den gewünschten Face-Index, sende ihn aber erst
+    # nachdem der Viewer den neuen Geo-Dump verarbeitet hat.
+    pending_face = int(text.split(None, 1)[1])
+    _log_recv(text)
+    return True
+
+
+# keyed on the leading "#tag#" of a line
+TAG_HANDLERS = {
+    "#noprefix#":    _h_noprefix,
+    "#endnoprefix#": _h_endnoprefix,
+    "#geo#":         _h_geo,
+    "#endgeo#":      _h_endgeo,
+    "#face#":        _h_face,
+}
+
+
+def _handle_line(raw: bytes):
+    """Route one inbound line: meta-tags, geometry collection, logging."""
+    text = None
+    if raw[:1] == b"#":
+        text = raw.decode(errors="replace")
+        handler = TAG_HANDLERS.get(text[:text.find("#", 1) + 1])
+        if handler and handler(text):
             return
 
-    try:
-        if isinstance(packet, str):
-            viewer_in.write(packet + "\n")
-        else:
-            viewer_in.writelines(l + "\n" for l in packet)
-        viewer_in.flush()
-    except Exception as e:
-        logging.error("[viewer pipe] %s", e)
+    # Collect geometry lines - kept as bytes, _parse reads them undecoded
+    if collecting and not map_dump_mode:
+        geometry_buf.extend(raw)
+        geometry_buf.extend(b"\n")
+        #_log_recv(text)  # still log for completeness
+        return
 
+    # Normal line - log & print
+    _log_recv(text if text is not None else raw.decode(errors="replace"))
 
-# ── drain() - parse inbound stream ────────────────────────────────────────
 
-def drain():
-    """Consume bytes, split into CR/LF-terminated lines, handle meta-tags."""
-    global recv_buffer, collecting, buffer_lines, got_geometry, pending_face, map_dump_mode
+# ── background reader ─────────────────────────────────────────────────────
+# The reader thread only does the blocking read + line split and hands the
+# lines (or the read error) to rx_queue. Everything touching the GUI or the
+# viewer runs in process_rx_queue(), called from the Qt thread.
 
-    if not ser or not ser.is_open:
+def _reader_loop():
+    while not _reader_stop.is_set():
+        port = ser   # the GUI thread may swap ser at any time
+        if not port or not port.is_open:
+            time.sleep(0.05)
+            continue
+        try:
+            lines = _read_lines(port)
+        except Exception as e:
+            rx_queue.put(e)
+            if ser is port:   # not one the GUI has reopened meanwhile
+                close_serial()
+            _notify_rx()
+            continue
+        for text in lines:
+            rx_queue.put(text)
+        if lines:
+            _notify_rx()
+
+
+def _notify_rx():
+    # one wake-up per drain: later reads only queue until process_rx_queue ran
+    if on_rx and not _rx_notified.is_set():
+        _rx_notified.set()
+        on_rx()
+
+
+def start_reader():
+    """Start the background serial reader (idempotent)."""
+    global reader_thread
+    if reader_thread and reader_thread.is_alive():
         return
-    try:
-        data = ser.read(ser.in_waiting or 1)
-        if not data:
+    _reader_stop.clear()
+    reader_thread = threading.Thread(target=_reader_loop, name="serial-reader", daemon=True)
+    reader_thread.start()
+
+
+def stop_reader():
+    global reader_thread
+    _reader_stop.set()
+    if reader_thread:
+        reader_thread.join(timeout=1.0)
+    reader_thread = None
+
+
+def process_rx_queue():
+    """Handle all lines queued by the reader thread. Call from the GUI thread."""
+    _rx_notified.clear()   # before draining, so nothing queued now goes unsignalled
+    while True:
+        try:
+            item = rx_queue.get_nowait()
+        except queue.Empty:
             return
-        recv_buffer += data
-        while True:
-            sep_idx = min((i for i in (recv_buffer.find(b"\n"), recv_buffer.find(b"\r")) if i != -1), default=-1)
-            if sep_idx == -1:
-                break
-            line, recv_buffer = recv_buffer[:sep_idx], recv_buffer[sep_idx+1:]
-            text = line.decode(errors="replace").rstrip("\r")
-            if not text:
-                continue
-
-            # Handle noprefix sections (raw passthrough, hidden by default)
-            if text == "#noprefix#":
-                map_dump_mode = True
-                _log_recv(text)
-                continue
-            if text == "#endnoprefix#" and map_dump_mode:
-                _log_recv(text)
-                map_dump_mode = False
-                continue
-
-            if map_dump_mode:
-                _log_recv(text)
-                continue
-
-            # Geometry stream start
-            if text.startswith("#geo#"):
-                collecting = True
-                buffer_lines = []
-                buffer_lines = [text]
-                _log_recv(text)
-                continue
-
-                        # End of geometry
-            if text.startswith("#endgeo#") and collecting:
-                buffer_lines.append(text)
-                collecting = False
-                got_geometry = True
-                _viewer_send(buffer_lines)
-                _log_recv(text)
-                continue
-
-            # Face selection
-            if text.startswith("#face#"):
-                # Merke dir den gewünschten Face-Index, sende ihn aber erst
-                # nachdem der Viewer den neuen Geo-Dump verarbeitet hat.
-                pending_face = int(text.split(None, 1)[1])
-                _log_recv(text)
-                continue
-
-
-            # Collect geometry lines
-            if collecting:
-                buffer_lines.append(text)
-                #_log_recv(text)  # still log for completeness
-                continue
-
-            # Normal line - log & print
-            _log_recv(text)
-    except Exception as e:
-        logging.error("[rx error] %s", e)
-        close_serial()
+        if isinstance(item, Exception):
+            logging.error("[rx error] %s", item)
+            continue
+        try:
+            _handle_line(item)
+        except Exception as e:
+            logging.error("[rx error] %s", e)